@@ -5,6 +5,7 @@ Example usage of the Hand-Eye Calibration functions from the Robot Client Interf
 
 import time
 import logging
+from typing import Tuple
 
 # High-level GRI client facade and pose helper
 import gri_client as client
@@ -12,18 +13,43 @@ import gri_actions as actions
 from gri_comms import RobotPose  # For creating pose objects
 
 PIPELINE_ID = 0
+SETTLE_TIME_S = 0.5  # Typical simulated movement/settling time per pose
 
-# Setup logger for this example
+# Logger for this example; handlers are configured in main()
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+
+
+# Simulated calibration poses, built once at import.
+# In a real robot, these poses would be acquired from the robot controller's
+# current flange pose when a calibration grid is visible.
+_CALIB_POSES: Tuple[RobotPose, ...] = (
+    # Example poses (mm, quaternion) - Replace with actual robot poses
+    RobotPose(x=100, y=0, z=300, q1=0, q2=0, q3=0, q4=1),
+    RobotPose(
+        x=150, y=50, z=310, q1=0.1, q2=0, q3=0, q4=0.9949
+    ),  # Approx 11.5 deg rot Y
+    RobotPose(
+        x=100, y=100, z=300, q1=0, q2=0.1, q3=0, q4=0.9949
+    ),  # Approx 11.5 deg rot X
+    RobotPose(
+        x=50, y=50, z=290, q1=0, q2=0, q3=0.1, q4=0.9949
+    ),  # Approx 11.5 deg rot Z
+    RobotPose(x=120, y=20, z=320, q1=-0.1, q2=0, q3=0, q4=0.9949),
+    RobotPose(x=120, y=80, z=280, q1=0, q2=-0.1, q3=0, q4=0.9949),
+    RobotPose(x=80, y=20, z=310, q1=0, q2=0, q3=-0.1, q4=0.9949),
+    RobotPose(
+        x=80, y=80, z=305, q1=0.071, q2=0.071, q3=0.071, q4=0.992
+    ),  # Combined rotation
+)  # Exactly eight distinct poses recommended by Roboception
 
 
 def log_action_summary(name: str, report: client.ActionReport) -> None:
     """Helper to log a concise summary of an action result."""
 
     if report.response:
+        # Skip the description lookup entirely when INFO records are discarded
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
             "%s -> error_code=%s (%s), node_return=%s, data2=%s, data3=%s",
             name,
@@ -37,10 +63,30 @@ def log_action_summary(name: str, report: client.ActionReport) -> None:
         logger.error("%s -> %s", name, report.error or "No response received")
 
 
-def perform_example_hand_eye_calibration(pipeline_id: int = PIPELINE_ID):
-    """Demonstrates the hand-eye calibration sequence using the interface."""
+def _check_set_pose_result(slot_id: int, set_result: client.HECResult) -> bool:
+    """Check a HEC_SET_POSE result; only failures are logged in full."""
+
+    if not set_result.acknowledged:
+        log_action_summary(f"HEC_SET_POSE slot {slot_id}", set_result)
+        logger.error("HEC Set Pose for slot %s failed. Aborting calibration.", slot_id)
+        return False
+    logger.debug("HEC_SET_POSE slot %d ack", slot_id)
+    return True
+
+
+def perform_example_hand_eye_calibration(
+    pipeline_id: int = PIPELINE_ID, settle_s: float = 0.0
+):
+    """
+    Demonstrates the hand-eye calibration sequence using the interface.
+
+    With a positive ``settle_s`` (e.g. SETTLE_TIME_S) the poses are set one by
+    one after that simulated movement/settling time, as a real robot would
+    do. With ``settle_s=0`` no motion is simulated and all poses are sent in
+    one pipelined batch.
+    """
     logger.info(
-        f"--- Starting Hand-Eye Calibration Demo for pipeline {pipeline_id} ---"
+        "--- Starting Hand-Eye Calibration Demo for pipeline %s ---", pipeline_id
     )
 
     status_result = client.get_status(debug=True)
@@ -52,43 +98,32 @@ def perform_example_hand_eye_calibration(pipeline_id: int = PIPELINE_ID):
         logger.error("HEC Init failed. Aborting calibration demo.")
         return False  # Indicate failure
 
-    # Simulate moving to poses and setting them
-    # In a real robot, these poses would be acquired from the robot controller's
-    # current flange pose when a calibration grid is visible.
-    calib_poses = [
-        # Example poses (mm, quaternion) - Replace with actual robot poses
-        RobotPose(x=100, y=0, z=300, q1=0, q2=0, q3=0, q4=1),
-        RobotPose(
-            x=150, y=50, z=310, q1=0.1, q2=0, q3=0, q4=0.9949
-        ),  # Approx 11.5 deg rot Y
-        RobotPose(
-            x=100, y=100, z=300, q1=0, q2=0.1, q3=0, q4=0.9949
-        ),  # Approx 11.5 deg rot X
-        RobotPose(
-            x=50, y=50, z=290, q1=0, q2=0, q3=0.1, q4=0.9949
-        ),  # Approx 11.5 deg rot Z
-        RobotPose(x=120, y=20, z=320, q1=-0.1, q2=0, q3=0, q4=0.9949),
-        RobotPose(x=120, y=80, z=280, q1=0, q2=-0.1, q3=0, q4=0.9949),
-        RobotPose(x=80, y=20, z=310, q1=0, q2=0, q3=-0.1, q4=0.9949),
-        RobotPose(
-            x=80, y=80, z=305, q1=0.071, q2=0.071, q3=0.071, q4=0.992
-        ),  # Combined rotation
-    ]  # Exactly eight distinct poses recommended by Roboception
-
     logger.info("GRI HEC sequence: INIT -> 8x SET_POSE -> CALIBRATE")
-    for slot_id, pose in enumerate(calib_poses, start=1):
-        logger.info(
-            "Simulating move and setting HEC pose for slot %s: %s", slot_id, pose
-        )
-        time.sleep(0.5)  # Placeholder for robot movement/settling
-        set_result = client.hec_set_pose(pipeline_id, slot_id, pose, debug=True)
-        log_action_summary(f"HEC_SET_POSE slot {slot_id}", set_result)
-        if not set_result.acknowledged:
-            logger.error(
-                "HEC Set Pose for slot %s failed. Aborting calibration.", slot_id
+    if settle_s > 0.0:
+        # One request per slot: the robot has to reach and settle at each
+        # pose first, and must not leave it before the pose is acknowledged.
+        # The simulated step time is paced against a monotonic deadline that
+        # starts with the previous request, so its blocking round trip counts
+        # toward the step instead of adding to it.
+        next_deadline = time.monotonic() + settle_s
+        for slot_id, pose in enumerate(_CALIB_POSES, start=1):
+            logger.info(
+                "Simulating move and setting HEC pose for slot %s: %s", slot_id, pose
             )
-            return False  # Indicate failure
-        time.sleep(0.2)  # Small delay between setting poses
+            # Placeholder for robot movement/settling
+            time.sleep(max(0.0, next_deadline - time.monotonic()))
+            next_deadline = time.monotonic() + settle_s
+            set_result = client.hec_set_pose(pipeline_id, slot_id, pose, debug=True)
+            if not _check_set_pose_result(slot_id, set_result):
+                return False  # Indicate failure
+    else:
+        # No motion in between: pipeline all eight poses into a single round trip
+        slot_poses = list(enumerate(_CALIB_POSES, start=1))
+        set_results = client.hec_set_poses_batch(pipeline_id, slot_poses, debug=True)
+        for (slot_id, _), set_result in zip(slot_poses, set_results):
+            if not _check_set_pose_result(slot_id, set_result):
+                return False  # Indicate failure
+    logger.info("HEC set %d/%d poses", len(_CALIB_POSES), len(_CALIB_POSES))
 
     # Trigger the calibration calculation
     hec_calibrate_result = client.hec_calibrate(pipeline_id, debug=True)
@@ -106,6 +141,16 @@ def perform_example_hand_eye_calibration(pipeline_id: int = PIPELINE_ID):
 
 def main():
     """Main example demonstrating the hand-eye calibration sequence."""
+    # Configure logging only when run as a script. Skip the process/thread
+    # lookups and timestamp rendering for every record; force=True replaces
+    # the default handler installed by gri_comms.
+    logging.logProcesses = False
+    logging.logThreads = False
+    logging.logMultiprocessing = False
+    logging.basicConfig(
+        level=logging.INFO, format="%(levelname)s - %(message)s", force=True
+    )
+
     logger.info("--- Hand-Eye Calibration Example Program Starting ---")
 
     # Attempt to connect to the server using details from gri_config.py
@@ -117,7 +162,7 @@ def main():
 
     # --- Run the HEC Demo ---
     calibration_successful = perform_example_hand_eye_calibration(
-        pipeline_id=PIPELINE_ID
+        pipeline_id=PIPELINE_ID, settle_s=SETTLE_TIME_S
     )
     if calibration_successful:
         logger.info("HEC process initiated.")
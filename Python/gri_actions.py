@@ -13,7 +13,8 @@ type-safe way and obtain human readable descriptions where appropriate.
 from __future__ import annotations
 
 from enum import IntEnum
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 
 class Action(IntEnum):
@@ -103,10 +104,31 @@ ERROR_DESCRIPTIONS: Dict[int, str] = {
 }
 
 
+# Error codes form the dense range [-18, 4]; a tuple indexed by the offset
+# code is cheaper to query than hashing into the dict above.
+_ERROR_MIN = int(min(ERROR_DESCRIPTIONS))
+_ERROR_MAX = int(max(ERROR_DESCRIPTIONS))
+_ERROR_LUT: Tuple[Optional[str], ...] = tuple(
+    ERROR_DESCRIPTIONS.get(code) for code in range(_ERROR_MIN, _ERROR_MAX + 1)
+)
+
+
 def describe_error(code: int) -> str:
     """Return a human-readable description for a GRI error/warning code."""
 
-    return ERROR_DESCRIPTIONS.get(code, f"Unknown error code: {code}")
+    index = code - _ERROR_MIN
+    if 0 <= index < len(_ERROR_LUT):
+        description = _ERROR_LUT[index]
+        if description is not None:
+            return description
+    return _describe_unknown_error(int(code))
+
+
+@lru_cache(maxsize=64)
+def _describe_unknown_error(code: int) -> str:
+    """Build (once per code) the description for a code outside the table."""
+
+    return f"Unknown error code: {code}"
 
 
 JOB_STATUS_NAMES: Dict[int, str] = {
@@ -118,7 +140,14 @@ JOB_STATUS_NAMES: Dict[int, str] = {
 }
 
 
+_STATUS_LUT: Tuple[str, ...] = tuple(
+    JOB_STATUS_NAMES[status] for status in range(len(JOB_STATUS_NAMES))
+)
+
+
 def describe_status(status: int) -> str:
     """Return a human-readable label for a job status code."""
 
-    return JOB_STATUS_NAMES.get(status, f"UNRECOGNIZED({status})")
+    if 0 <= status < len(_STATUS_LUT):
+        return _STATUS_LUT[status]
+    return f"UNRECOGNIZED({status})"
@@ -0,0 +1,319 @@
+# gri_async.py
+"""
+asyncio-based GRI client for running several connections concurrently.
+
+The blocking `gri_comms` API serializes all network I/O, so round trips to
+several servers (or several HEC pipelines on separate connections) add up.
+`AsyncGriClient` wraps one TCP connection in asyncio streams; running
+multiple clients with ``asyncio.gather`` overlaps their round trips.
+
+The blocking `gri_comms.GriClient` remains the default API used by
+`gri_client` and the examples. This module does not import `gri_comms`, so
+it leaves the application's logging configuration alone and returns plain
+`gri_protocol.Pose` objects.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+import gri_config as cfg
+import gri_actions as actions
+import gri_protocol as protocol
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGriClient:
+    """
+    An asyncio connection to one GRI server.
+
+    Requests on one client are serialized by a lock, as the server answers in
+    request order; use one client per connection to run requests concurrently.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            host: Server address; defaults to gri_config.SERVER_IP at connect time.
+            port: Server port; defaults to gri_config.SERVER_PORT at connect time.
+            timeout: Per-exchange timeout in seconds; defaults to gri_config.SERVER_TIMEOUT.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the client holds an open connection."""
+        return self._writer is not None
+
+    def _timeout(self) -> float:
+        return cfg.SERVER_TIMEOUT if self.timeout is None else self.timeout
+
+    async def connect(self) -> bool:
+        """
+        Opens the TCP connection to the server.
+
+        Returns:
+            True if connection is successful, False otherwise.
+        """
+        if self._writer is not None:
+            logger.info("Already connected.")
+            return True
+
+        host = cfg.SERVER_IP if self.host is None else self.host
+        port = cfg.SERVER_PORT if self.port is None else self.port
+        logger.info("Attempting to connect to %s:%s...", host, port)
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), self._timeout()
+            )
+        except asyncio.TimeoutError:
+            logger.error("Connection timed out.")
+            return False
+        except OSError as e:
+            logger.error("Socket connection error: %s", e)
+            return False
+
+        logger.info("Successfully connected to server.")
+        return True
+
+    async def disconnect(self) -> None:
+        """Closes the TCP connection."""
+        writer = self._writer
+        if writer is None:
+            logger.info("Already disconnected.")
+            return
+
+        logger.info("Disconnecting from server...")
+        self._reader = self._writer = None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError as e:
+            logger.debug("Error while closing connection (ignoring): %s", e)
+        logger.info("Socket closed.")
+
+    async def _exchange(
+        self, payload: bytes, response_count: int, debug: bool = False
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Sends a payload of one or more requests and reads ``response_count`` responses.
+
+        Returns:
+            A tuple (concatenated_responses_or_None, error_message_or_None).
+        """
+        async with self._lock:
+            if self._writer is None or self._reader is None:
+                err_msg = "Communication error: Not connected."
+                logger.error(err_msg)
+                return None, err_msg
+
+            try:
+                # One timeout covers the whole round trip, including a drain
+                # stalled by a server that stopped reading
+                data = await asyncio.wait_for(
+                    self._send_and_receive(payload, response_count, debug),
+                    self._timeout(),
+                )
+            except asyncio.CancelledError:
+                # The request may be half sent or its response still pending
+                await self.disconnect()
+                raise
+            except asyncio.TimeoutError:
+                err_msg = "Communication error: Socket operation timed out."
+                logger.error(err_msg)
+                # Late responses would be read as the answers to later
+                # requests, so the connection cannot be reused
+                await self.disconnect()
+                return None, err_msg
+            except asyncio.IncompleteReadError:
+                err_msg = (
+                    "Communication error: Connection closed by server during receive."
+                )
+                logger.error(err_msg)
+                await self.disconnect()
+                return None, err_msg
+            except OSError as e:
+                err_msg = f"Communication error: Socket send/receive error: {e}."
+                logger.error(err_msg)
+                await self.disconnect()
+                return None, err_msg
+
+            if debug and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received %d bytes: %s", len(data), data.hex())
+            return data, None
+
+    async def _send_and_receive(
+        self, payload: bytes, response_count: int, debug: bool
+    ) -> bytes:
+        """Writes the payload and reads ``response_count`` raw responses."""
+        self._writer.write(payload)
+        await self._writer.drain()
+        if debug and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sent %d bytes: %s", len(payload), payload.hex())
+        return await self._reader.readexactly(response_count * protocol.RESPONSE_LENGTH)
+
+    async def send_action(
+        self,
+        action: actions.Action,
+        job_id: int,
+        pose: Optional[protocol.Pose] = None,
+        data_fields: Sequence[int] = (0, 0, 0, 0),
+        debug: bool = False,
+    ) -> Optional[protocol.ResponseMessage]:
+        """
+        Pack, send, and decode a protocol action.
+
+        Returns the parsed ResponseMessage or None if a communication or decoding
+        error occurs.
+        """
+        responses = await self.send_actions_batch(
+            [protocol.RequestMessage(action, job_id, pose, data_fields)], debug=debug
+        )
+        return responses[0] if responses else None
+
+    async def send_actions_batch(
+        self, requests: Sequence[protocol.RequestMessage], debug: bool = False
+    ) -> Optional[List[Optional[protocol.ResponseMessage]]]:
+        """
+        Pipelines several requests in one round trip and decodes the responses.
+
+        Returns:
+            One decoded response per request (None where decoding failed), or
+            None if the exchange failed.
+        """
+        if not requests:
+            return []
+
+        data, comm_error = await self._exchange(
+            protocol.pack_requests(requests), len(requests), debug=debug
+        )
+        if data is None:
+            logger.error(
+                "%s(job=%s): Communication failed: %s",
+                requests[0].action.name,
+                requests[0].job_id,
+                comm_error,
+            )
+            return None
+
+        length = protocol.RESPONSE_LENGTH
+        view = memoryview(data)
+        responses: List[Optional[protocol.ResponseMessage]] = []
+        for index, request in enumerate(requests):
+            try:
+                responses.append(
+                    protocol.ResponseMessage.from_bytes(
+                        view[index * length : (index + 1) * length]
+                    )
+                )
+            except ValueError as exc:
+                logger.error(
+                    "%s(job=%s): Failed to decode response: %s",
+                    request.action.name,
+                    request.job_id,
+                    exc,
+                )
+                responses.append(None)
+        return responses
+
+    async def drain_primary_poses(
+        self, job_id: int, debug: bool = False
+    ) -> List[protocol.Pose]:
+        """
+        Retrieves all remaining primary poses of a job.
+
+        Like `gri_comms.drain_primary_poses`, the count reported with the first
+        pose decides how many GET_NEXT_POSE requests to pipeline next.
+
+        Returns:
+            The retrieved poses in server order; empty if none could be fetched.
+        """
+        poses: List[protocol.Pose] = []
+        # Packing only reads the request, so one instance serves every batch
+        request = protocol.RequestMessage(actions.Action.GET_NEXT_POSE, job_id)
+        batch_size = 1
+        while batch_size:
+            responses = await self.send_actions_batch(
+                [request] * batch_size, debug=debug
+            )
+            if responses is None:
+                break
+
+            batch_size = 0
+            for response in responses:
+                if (
+                    response is None
+                    or response.error_code != actions.ErrorCode.NO_ERROR
+                ):
+                    # NO_POSES_FOUND (or an error) ends the drain
+                    batch_size = 0
+                    break
+                poses.append(response.pose)
+                batch_size = min(response.remaining_primary, protocol.DRAIN_BATCH_SIZE)
+
+        logger.info(
+            "drain_primary_poses(job=%s): Retrieved %s primary poses.",
+            job_id,
+            len(poses),
+        )
+        return poses
+
+    async def hec_set_poses(
+        self,
+        pipeline_id: int,
+        slot_poses: Sequence[Tuple[int, protocol.Pose]],
+        debug: bool = False,
+    ) -> List[Tuple[bool, Optional[protocol.ResponseMessage]]]:
+        """
+        Sends several hand-eye calibration poses in one pipelined burst.
+
+        Returns:
+            One (success_flag, response_or_None) tuple per slot, in input order.
+        """
+        responses = await self.send_actions_batch(
+            [
+                protocol.RequestMessage(
+                    actions.Action.HEC_SET_POSE,
+                    0,
+                    pose,
+                    (pipeline_id, slot_id, 0, 0),
+                )
+                for slot_id, pose in slot_poses
+            ],
+            debug=debug,
+        )
+        if responses is None:
+            return [(False, None) for _ in slot_poses]
+
+        results: List[Tuple[bool, Optional[protocol.ResponseMessage]]] = []
+        for (slot_id, _), response in zip(slot_poses, responses):
+            if response is None:
+                results.append((False, None))
+            elif response.error_code == actions.ErrorCode.NO_ERROR:
+                logger.info(
+                    "hec_set_pose(pipeline=%s, slot=%s): Pose set successfully.",
+                    pipeline_id,
+                    slot_id,
+                )
+                results.append((True, response))
+            else:
+                logger.error(
+                    "hec_set_pose(pipeline=%s, slot=%s): Server returned error: %s (Code: %s)",
+                    pipeline_id,
+                    slot_id,
+                    actions.describe_error(response.error_code),
+                    response.error_code,
+                )
+                results.append((False, response))
+        return results
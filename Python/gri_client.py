@@ -10,89 +10,87 @@ information without manually inspecting protocol responses.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
 
 import gri_actions as actions
 import gri_protocol as protocol
 import gri_comms as comms
 
+# Plain-int copies of the codes checked on every response
+_NO_ERROR = int(actions.ErrorCode.NO_ERROR)
+_NO_POSES = int(actions.ErrorCode.NO_POSES_FOUND)
+_NO_RELATED = int(actions.ErrorCode.NO_RELATED_POSES)
 
-@dataclass
+
+@dataclass(slots=True)
 class ActionReport:
     """Common metadata returned by helper functions."""
 
     response: Optional[protocol.ResponseMessage]
     error: Optional[str] = None
+    success: bool = field(init=False, repr=False, compare=False)
+    error_code: Optional[int] = field(init=False, repr=False, compare=False)
 
-    @property
-    def success(self) -> bool:
-        return (
-            self.response is not None
-            and self.response.error_code == actions.ErrorCode.NO_ERROR
-        )
-
-    @property
-    def error_code(self) -> Optional[int]:
-        return None if self.response is None else self.response.error_code
+    def __post_init__(self) -> None:
+        # Derived once; the response is not expected to change afterwards
+        self.error_code = None if self.response is None else self.response.error_code
+        self.success = self.error_code == _NO_ERROR
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusResult(ActionReport):
     ready: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncJobResult(ActionReport):
     pose: Optional[comms.RobotPose] = None
     remaining_primary: Optional[int] = None
     remaining_related: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AsyncTriggerResult(ActionReport):
     acknowledged: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class JobStatusResult(ActionReport):
     status: int = actions.JobStatus.UNKNOWN
+    status_label: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def status_label(self) -> str:
-        return actions.describe_status(self.status)
+    def __post_init__(self) -> None:
+        # Explicit base call: zero-argument super() fails in slotted dataclasses
+        ActionReport.__post_init__(self)
+        self.status_label = actions.describe_status(self.status)
 
 
-@dataclass
+@dataclass(slots=True)
 class PoseRetrievalResult(ActionReport):
     pose: Optional[comms.RobotPose] = None
     remaining_primary: Optional[int] = None
     remaining_related: Optional[int] = None
+    # True if no pose was retrieved and the server reported exhaustion
+    exhausted: bool = field(init=False, repr=False, compare=False)
 
-    @property
-    def exhausted(self) -> bool:
-        """Return True if no pose was retrieved and the server reported exhaustion."""
-
-        return (
-            self.response is not None
-            and self.response.error_code == actions.ErrorCode.NO_POSES_FOUND
-        )
+    def __post_init__(self) -> None:
+        ActionReport.__post_init__(self)
+        self.exhausted = self.error_code == _NO_POSES
 
 
-@dataclass
+@dataclass(slots=True)
 class RelatedPoseResult(ActionReport):
     pose: Optional[comms.RobotPose] = None
     remaining_related: Optional[int] = None
+    exhausted: bool = field(init=False, repr=False, compare=False)
 
-    @property
-    def exhausted(self) -> bool:
-        return (
-            self.response is not None
-            and self.response.error_code == actions.ErrorCode.NO_RELATED_POSES
-        )
+    def __post_init__(self) -> None:
+        ActionReport.__post_init__(self)
+        self.exhausted = self.error_code == _NO_RELATED
 
 
-@dataclass
+@dataclass(slots=True)
 class HECResult(ActionReport):
     acknowledged: bool = False
 
@@ -161,11 +159,8 @@ def get_job_status(job_id: int, debug: bool = False) -> JobStatusResult:
     """Retrieve the status of an asynchronous job."""
 
     status_code, response = comms.get_job_status(job_id, debug=debug)
-    error = (
-        _error_from_response(response)
-        if response and response.error_code != actions.ErrorCode.NO_ERROR
-        else None
-    )
+    # A missing response is reported via status UNKNOWN, not as an error string
+    error = None if response is None else response.error_description
     return JobStatusResult(
         response=response,
         error=error,
@@ -187,7 +182,7 @@ def get_next_pose(job_id: int, debug: bool = False) -> PoseRetrievalResult:
     success, pose, rem_primary, rem_related, response = comms.get_next_pose(
         job_id, debug=debug
     )
-    error = _error_from_response(response) if not success else None
+    error = _error_from_response(response)
     return PoseRetrievalResult(
         response=response,
         error=error,
@@ -197,11 +192,17 @@ def get_next_pose(job_id: int, debug: bool = False) -> PoseRetrievalResult:
     )
 
 
+def drain_primary_poses(job_id: int, debug: bool = False) -> List[comms.RobotPose]:
+    """Fetch all remaining primary poses, pipelining the GET_NEXT_POSE requests."""
+
+    return comms.drain_primary_poses(job_id, debug=debug)
+
+
 def get_related_pose(job_id: int, debug: bool = False) -> RelatedPoseResult:
     """Fetch a related pose for the current primary result."""
 
     success, pose, rem_related, response = comms.get_related_pose(job_id, debug=debug)
-    error = _error_from_response(response) if not success else None
+    error = _error_from_response(response)
     return RelatedPoseResult(
         response=response,
         error=error,
@@ -228,6 +229,27 @@ def hec_set_pose(
     return HECResult(response=response, error=error, acknowledged=success)
 
 
+def hec_set_poses_batch(
+    pipeline_id: int,
+    slot_poses: Sequence[Tuple[int, comms.RobotPose]],
+    pipeline: bool = True,
+    debug: bool = False,
+) -> List[HECResult]:
+    """Send several calibration poses, pipelined into a single round trip."""
+
+    results = comms.hec_set_poses_batch(
+        pipeline_id, slot_poses, pipeline=pipeline, debug=debug
+    )
+    return [
+        HECResult(
+            response=response,
+            error=_error_from_response(response),
+            acknowledged=success,
+        )
+        for success, response in results
+    ]
+
+
 def hec_calibrate(pipeline_id: int, debug: bool = False) -> HECResult:
     """Execute the calibration calculation."""
 
@@ -241,6 +263,4 @@ def _error_from_response(response: Optional[protocol.ResponseMessage]) -> Option
 
     if response is None:
         return "No response received"
-    if response.error_code == actions.ErrorCode.NO_ERROR:
-        return None
-    return actions.describe_error(response.error_code)
+    return response.error_description
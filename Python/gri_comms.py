@@ -8,9 +8,11 @@ This module implements the client-side logic based on the GRI V1 specification.
 """
 
 import socket
+import threading
 import time
 import logging
-from typing import Optional, Sequence, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 # Import connection configuration settings
 import gri_config as cfg
@@ -24,12 +26,20 @@ logging.basicConfig(
 )
 
 
+@dataclass(slots=True)
 class RobotPose(protocol.Pose):
     """
     Represents a robot pose using millimeters for position (x, y, z)
     and quaternion for rotation (q1, q2, q3, q4).
+
+    The quaternion is normalized on construction, so approximate literals
+    reach the server as unit quaternions.
     """
 
+    def __post_init__(self):
+        """Normalizes the quaternion; unit quaternions are left unchanged."""
+        self.normalize()
+
     def __str__(self):
         """Provides a string representation of the pose."""
         return (
@@ -42,243 +52,555 @@ class RobotPose(protocol.Pose):
         self.normalize()
 
 
-def _copy_pose(pose: protocol.Pose) -> protocol.Pose:
-    """Create a defensive copy of a pose to avoid in-place normalization side-effects."""
-
-    return protocol.Pose(pose.x, pose.y, pose.z, pose.q1, pose.q2, pose.q3, pose.q4)
-
-
 def _as_robot_pose(pose: protocol.Pose) -> RobotPose:
-    """Convert a protocol pose into a RobotPose instance."""
+    """
+    Convert a protocol pose into a RobotPose instance without copying it.
+
+    RobotPose adds no fields to protocol.Pose, so the decoded pose is re-classed
+    in place; the response's pose and the returned pose are the same object.
+    The values are kept exactly as decoded: unlike on construction, the
+    quaternion is not normalized.
+    """
 
-    return RobotPose(pose.x, pose.y, pose.z, pose.q1, pose.q2, pose.q3, pose.q4)
+    pose.__class__ = RobotPose
+    return pose
 
 
-# --- Global State ---
-_client_socket: Optional[socket.socket] = None
-_is_connected: bool = False
+# First back-off interval of wait_for_job; doubled up to its delay_s
+_WAIT_MIN_DELAY_S = 0.005
 
 # --- Low-Level Socket Communication & Protocol Handling ---
 
 
-def socket_connect() -> bool:
+class GriClient:
     """
-    Establishes a TCP socket connection to the server defined in gri_config.
-
-    Uses SERVER_IP, SERVER_PORT, and SERVER_TIMEOUT from the config.
+    A TCP connection to one GRI server.
 
-    Returns:
-        True if connection is successful, False otherwise.
-    """
-    global _client_socket, _is_connected
-    if _is_connected:
-        logger.info("Already connected.")
-        return True
-
-    logger.info(f"Attempting to connect to {cfg.SERVER_IP}:{cfg.SERVER_PORT}...")
-    try:
-        _client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        # TCP Keepalive settings (optional, but good practice for robustness)
-        _client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-        if hasattr(socket, "TCP_KEEPIDLE"):  # Linux/macOS
-            _client_socket.setsockopt(
-                socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 5
-            )  # Idle time
-            _client_socket.setsockopt(
-                socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 5
-            )  # Interval
-            _client_socket.setsockopt(
-                socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3
-            )  # Probes
-        # Note: Windows uses SIO_KEEPALIVE_VALS, which is more complex via ioctl
-
-        _client_socket.settimeout(cfg.SERVER_TIMEOUT)
-        _client_socket.connect((cfg.SERVER_IP, cfg.SERVER_PORT))
-        _is_connected = True
-        logger.info("Successfully connected to server.")
-        return True
-    except socket.timeout:
-        logger.error("Connection timed out.")
-        _client_socket = None
-        _is_connected = False
-        return False
-    except socket.error as e:
-        logger.error(f"Socket connection error: {e}")
-        _client_socket = None
-        _is_connected = False
-        return False
-    except Exception as e:
-        logger.error(f"Unexpected error during connection: {e}")
-        _client_socket = None
-        _is_connected = False
-        return False
-
-
-def socket_disconnect():
-    """Closes the active TCP socket connection."""
-    global _client_socket, _is_connected
-    if _is_connected and _client_socket:
-        logger.info("Disconnecting from server...")
-        try:
-            _client_socket.shutdown(socket.SHUT_RDWR)
-        except socket.error as e:
-            logger.debug(
-                f"Socket shutdown error (ignoring, might be already closed): {e}"
-            )
-        try:
-            _client_socket.close()
-        except socket.error as e:
-            logger.warning(f"Error closing socket: {e}")
-        finally:
-            _client_socket = None
-            _is_connected = False
-            logger.info("Socket closed.")
-    elif not _is_connected:
-        logger.info("Already disconnected.")
-
-
-def _send_action(
-    action: actions.Action,
-    job_id: int,
-    pose: Optional[protocol.Pose] = None,
-    data_fields: Sequence[int] = (0, 0, 0, 0),
-    debug: bool = False,
-) -> Optional[protocol.ResponseMessage]:
-    """
-    Pack, send, and decode a protocol action.
+    Holds the socket, the reusable request/response buffers and the prepacked
+    HEC_SET_POSE requests. A lock makes each request/response exchange atomic,
+    so a client can be shared between threads; use one client per server to
+    talk to several servers at once.
 
-    Returns the parsed ResponseMessage or None if a communication or decoding
-    error occurs.
+    The module-level functions operate on `default_client` unless another
+    client is passed to them.
     """
 
-    if len(data_fields) != 4:
-        raise ValueError("data_fields must contain exactly four integers.")
-
-    pose_for_request = _copy_pose(pose) if pose else protocol.Pose()
-    request = protocol.RequestMessage(
-        action=action,
-        job_id=job_id,
-        pose=pose_for_request,
-        data_fields=data_fields,
-    )
-    request_bytes = request.to_bytes()
-    response_bytes, comm_error = socket_send_receive(request_bytes, debug=debug)
-
-    if comm_error or not response_bytes:
-        logger.error(
-            "%s(job=%s): Communication failed: %s", action.name, job_id, comm_error
-        )
-        return None
-
-    try:
-        response = protocol.ResponseMessage.from_bytes(response_bytes)
-    except ValueError as exc:
-        logger.error(
-            "%s(job=%s): Failed to decode response: %s", action.name, job_id, exc
-        )
-        return None
-
-    return response
-
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            host: Server address; defaults to gri_config.SERVER_IP at connect time.
+            port: Server port; defaults to gri_config.SERVER_PORT at connect time.
+            timeout: Socket timeout in seconds; defaults to gri_config.SERVER_TIMEOUT.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        # Reentrant: error handling disconnects while an exchange holds the lock
+        self._lock = threading.RLock()
+        # Prepacked HEC_SET_POSE requests, one per pipeline ID
+        self._hec_set_pose_templates: Dict[int, protocol.RequestTemplate] = {}
+        # Reusable request message and buffers for single request/response
+        # exchanges; all of them are only touched while holding the lock
+        self._request = protocol.RequestMessage(actions.Action.STATUS, 0)
+        self._request_buffer = bytearray(protocol.REQUEST_LENGTH)
+        self._response_buffer = bytearray(protocol.RESPONSE_LENGTH)
+        self._response_view = memoryview(self._response_buffer)
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the client holds an open connection."""
+        return self._socket is not None
+
+    def connect(self) -> bool:
+        """
+        Establishes a TCP socket connection to the server.
+
+        Uses the client's host, port and timeout, falling back to SERVER_IP,
+        SERVER_PORT, and SERVER_TIMEOUT from the config.
+
+        Returns:
+            True if connection is successful, False otherwise.
+        """
+        with self._lock:
+            if self._socket is not None:
+                logger.info("Already connected.")
+                return True
+
+            host = cfg.SERVER_IP if self.host is None else self.host
+            port = cfg.SERVER_PORT if self.port is None else self.port
+            timeout = cfg.SERVER_TIMEOUT if self.timeout is None else self.timeout
+            logger.info("Attempting to connect to %s:%s...", host, port)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                # TCP Keepalive settings (optional, but good practice for robustness)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                if hasattr(socket, "TCP_KEEPIDLE"):  # Linux/macOS
+                    sock.setsockopt(
+                        socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 5
+                    )  # Idle time
+                    sock.setsockopt(
+                        socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 5
+                    )  # Interval
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)  # Probes
+                # Note: Windows uses SIO_KEEPALIVE_VALS, which is more complex via ioctl
+                # Small request/response frames: send immediately instead of letting
+                # Nagle's algorithm hold them back until the previous ACK arrives
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+                # Set once here; all later send/recv calls use this socket timeout
+                sock.settimeout(timeout)
+                sock.connect((host, port))
+            except socket.timeout:
+                logger.error("Connection timed out.")
+                sock.close()
+                return False
+            except socket.error as e:
+                logger.error("Socket connection error: %s", e)
+                sock.close()
+                return False
+            except Exception as e:
+                logger.error("Unexpected error during connection: %s", e)
+                sock.close()
+                return False
 
-def socket_send_receive(
-    request: bytes, debug: bool = False
-) -> Tuple[Optional[bytes], Optional[str]]:
-    """
-    Sends a request and attempts to receive a complete response.
+            self._socket = sock
+            logger.info("Successfully connected to server.")
+            return True
 
-    Handles basic socket communication errors and timeouts. Validates
-    the received response length against the internal RESPONSE_MESSAGE_LENGTH constant.
+    def disconnect(self, graceful: bool = True) -> None:
+        """
+        Closes the active TCP socket connection.
+
+        Args:
+            graceful: Shut the connection down before closing it. Error paths
+                pass False when the peer is already gone, skipping a shutdown
+                call that would only fail.
+        """
+        with self._lock:
+            sock = self._socket
+            if sock is None:
+                logger.info("Already disconnected.")
+                return
+
+            logger.info("Disconnecting from server...")
+            # Detach first so no sender picks up the socket being closed
+            self._socket = None
+            if graceful:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except socket.error as e:
+                    logger.debug(
+                        "Socket shutdown error (ignoring, might be already closed): %s",
+                        e,
+                    )
+            try:
+                sock.close()
+            except socket.error as e:
+                logger.warning("Error closing socket: %s", e)
+            finally:
+                logger.info("Socket closed.")
+
+    def send_action(
+        self,
+        action: actions.Action,
+        job_id: int,
+        pose: Optional[protocol.Pose] = None,
+        data_fields: Sequence[int] = (0, 0, 0, 0),
+        debug: bool = False,
+    ) -> Optional[protocol.ResponseMessage]:
+        """
+        Pack, send, and decode a protocol action.
+
+        Returns the parsed ResponseMessage or None if a communication or decoding
+        error occurs.
+        """
+
+        with self._lock:
+            # Refill the client's request instead of building one per call.
+            # Packing only reads the pose, so the caller's instance is used
+            # as is and released right after packing, even if it fails.
+            request = self._request
+            request.action = action
+            request.job_id = job_id
+            request.pose = pose
+            request.data_fields = data_fields
+            try:
+                request.validate()
+                # Pack and receive in place using the client's reusable buffers
+                request.pack_into(self._request_buffer)
+            finally:
+                request.pose = None
+                request.data_fields = (0, 0, 0, 0)
+            return self.send_packed_action(
+                self._request_buffer, action, job_id, debug=debug
+            )
 
-    Args:
-        request: The packed binary request bytes (should be REQUEST_MESSAGE_LENGTH).
-        debug: If True, logs the hex representation of sent/received bytes.
+    def send_packed_action(
+        self,
+        payload: Union[bytes, bytearray],
+        action: actions.Action,
+        job_id: int,
+        debug: bool = False,
+    ) -> Optional[protocol.ResponseMessage]:
+        """
+        Send an already packed request and decode its response.
+
+        ``action`` and ``job_id`` are only used for log messages.
+
+        Returns the parsed ResponseMessage or None if a communication or decoding
+        error occurs.
+        """
+
+        with self._lock:
+            comm_error = self._send_payload(payload, debug=debug) or self._receive_into(
+                self._response_view, debug=debug
+            )
 
-    Returns:
-        A tuple containing:
-            - bytes or None: The raw response bytes if successful and length is correct.
-            - str or None: An error message string if an error occurred.
-    """
-    global _client_socket, _is_connected
-    if not _is_connected or not _client_socket:
-        err_msg = "Communication error: Not connected."
-        logger.error(err_msg)
-        return None, err_msg
+            if comm_error:
+                logger.error(
+                    "%s(job=%s): Communication failed: %s",
+                    action.name,
+                    job_id,
+                    comm_error,
+                )
+                return None
 
-    try:
-        if len(request) != protocol.REQUEST_LENGTH:
+            try:
+                return protocol.ResponseMessage.from_bytes(self._response_buffer)
+            except ValueError as exc:
+                logger.error(
+                    "%s(job=%s): Failed to decode response: %s",
+                    action.name,
+                    job_id,
+                    exc,
+                )
+                return None
+
+    def send_receive(
+        self, request: bytes, debug: bool = False
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Sends a request and attempts to receive a complete response.
+
+        Handles basic socket communication errors and timeouts. Validates
+        the received response length against the internal RESPONSE_MESSAGE_LENGTH constant.
+
+        Args:
+            request: The packed binary request bytes (should be REQUEST_MESSAGE_LENGTH).
+            debug: If True, logs the hex representation of sent/received bytes.
+
+        Returns:
+            A tuple containing:
+                - bytes or None: The raw response bytes if successful and length is correct.
+                - str or None: An error message string if an error occurred.
+        """
+        # Invariant check for hand-packed requests; elided under python -O
+        if __debug__ and len(request) != protocol.REQUEST_LENGTH:
             logger.warning(
                 "Sending request with unexpected length: %s bytes. Expected %s.",
                 len(request),
                 protocol.REQUEST_LENGTH,
             )
 
-        bytes_sent = _client_socket.sendall(request)
-        if bytes_sent is not None:
-            err_msg = (
-                f"Communication error: Socket sendall failed (returned {bytes_sent})."
+        responses, err_msg = self.exchange(request, 1, debug=debug)
+        if responses is None:
+            return None, err_msg
+        return responses[0], None
+
+    def send_receive_batch(
+        self, requests: Union[bytes, bytearray], count: int, debug: bool = False
+    ) -> Tuple[Optional[List[bytes]], Optional[str]]:
+        """
+        Sends several concatenated requests at once and collects their responses.
+
+        The requests are written back-to-back with a single ``sendall`` before any
+        response is read (pipelining), so the whole batch costs roughly one network
+        round trip instead of one per request. The server answers in request order.
+
+        Args:
+            requests: The packed binary requests, concatenated (count * REQUEST_LENGTH bytes).
+            count: Number of requests contained in ``requests``.
+            debug: If True, logs the hex representation of sent/received bytes.
+
+        Returns:
+            A tuple containing:
+                - list of bytes or None: One raw response per request, in request order.
+                - str or None: An error message string if an error occurred.
+        """
+        if __debug__ and len(requests) != count * protocol.REQUEST_LENGTH:
+            logger.warning(
+                "Sending batch with unexpected length: %s bytes. Expected %s.",
+                len(requests),
+                count * protocol.REQUEST_LENGTH,
             )
+
+        return self.exchange(requests, count, debug=debug)
+
+    def _hec_set_pose_payload(
+        self, pipeline_id: int, slot_id: int, pose: protocol.Pose
+    ) -> bytearray:
+        """
+        Return the pipeline's HEC_SET_POSE request with slot and pose filled in.
+
+        The returned buffer is reused by the next call, so the caller must hold
+        the lock until it has been sent.
+        """
+        template = self._hec_set_pose_templates.get(pipeline_id)
+        if template is None:
+            template = protocol.RequestTemplate(
+                actions.Action.HEC_SET_POSE, data_fields=(pipeline_id, 0, 0, 0)
+            )
+            self._hec_set_pose_templates[pipeline_id] = template
+        template.set_data_field(1, slot_id)
+        template.set_pose(pose)
+        return template.buffer
+
+    def send_actions_batch(
+        self, requests: Sequence[protocol.RequestMessage], debug: bool = False
+    ) -> Tuple[Optional[List[Optional[protocol.ResponseMessage]]], Optional[str]]:
+        """
+        Pipelines several requests in one round trip and decodes the responses.
+
+        Returns:
+            A tuple (responses_or_None, error_message_or_None). On success the list
+            holds one decoded response per request, or None where decoding failed.
+        """
+        # Pack all requests with one struct call for a single sendall
+        frames, comm_error = self._exchange_frames(
+            protocol.pack_requests(requests), len(requests), debug=debug
+        )
+        if frames is None:
+            return None, comm_error
+
+        # Decode straight from slices of the receive buffer, without copies
+        length = protocol.RESPONSE_LENGTH
+        responses: List[Optional[protocol.ResponseMessage]] = []
+        for offset, request in zip(range(0, len(frames), length), requests):
+            try:
+                responses.append(
+                    protocol.ResponseMessage.from_bytes(
+                        frames[offset : offset + length]
+                    )
+                )
+            except ValueError as exc:
+                logger.error(
+                    "%s(job=%s): Failed to decode response: %s",
+                    request.action.name,
+                    request.job_id,
+                    exc,
+                )
+                responses.append(None)
+        return responses, None
+
+    def hec_set_pose(
+        self,
+        pipeline_id: int,
+        slot_id: int,
+        pose: protocol.Pose,
+        debug: bool = False,
+    ) -> Optional[protocol.ResponseMessage]:
+        """
+        Sends a HEC_SET_POSE request using the pipeline's prepacked template.
+
+        Returns the parsed ResponseMessage or None if a communication or decoding
+        error occurs.
+        """
+        with self._lock:
+            payload = self._hec_set_pose_payload(pipeline_id, slot_id, pose)
+            return self.send_packed_action(
+                payload, actions.Action.HEC_SET_POSE, 0, debug=debug
+            )
+
+    def exchange(
+        self,
+        payload: Union[bytes, bytearray],
+        response_count: int,
+        debug: bool = False,
+    ) -> Tuple[Optional[List[bytes]], Optional[str]]:
+        """
+        Sends a payload of one or more requests and receives ``response_count`` responses.
+
+        Returns:
+            A tuple (responses_or_None, error_message_or_None).
+        """
+        frames, err_msg = self._exchange_frames(payload, response_count, debug=debug)
+        if frames is None:
+            return None, err_msg
+        return _split_frames(frames), None
+
+    def _exchange_frames(
+        self,
+        payload: Union[bytes, bytearray],
+        response_count: int,
+        debug: bool = False,
+    ) -> Tuple[Optional[memoryview], Optional[str]]:
+        """
+        Like `exchange`, but returns all responses as one contiguous memoryview.
+
+        Callers that decode the frames in place (via slices of the view) avoid
+        copying each response into its own bytes object.
+        """
+        with self._lock:
+            err_msg = self._send_payload(payload, debug=debug)
+            if err_msg:
+                return None, err_msg
+            return self._receive_frames(response_count, debug=debug)
+
+    def _send_payload(
+        self, payload: Union[bytes, bytearray], debug: bool = False
+    ) -> Optional[str]:
+        """
+        Sends a payload of one or more requests without waiting for responses.
+
+        Returns:
+            None on success, otherwise an error message string.
+        """
+        if self._socket is None:
+            err_msg = "Communication error: Not connected."
             logger.error(err_msg)
-            socket_disconnect()
+            return err_msg
+
+        try:
+            bytes_sent = self._socket.sendall(payload)
+            if bytes_sent is not None:
+                err_msg = f"Communication error: Socket sendall failed (returned {bytes_sent})."
+                logger.error(err_msg)
+                self.disconnect(graceful=False)
+                return err_msg
+
+            if debug and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sent %d bytes: %s", len(payload), payload.hex())
+
+            return None  # Success
+
+        except Exception as e:
+            return self._handle_socket_exception(e)
+
+    def _receive_frames(
+        self, response_count: int, debug: bool = False
+    ) -> Tuple[Optional[memoryview], Optional[str]]:
+        """
+        Receives ``response_count`` responses into one freshly allocated buffer.
+
+        Returns:
+            A tuple (view_of_all_frames_or_None, error_message_or_None).
+        """
+        view = memoryview(bytearray(response_count * protocol.RESPONSE_LENGTH))
+        err_msg = self._receive_into(view, debug=debug)
+        if err_msg:
             return None, err_msg
+        return view, None
+
+    def _receive_into(self, view: memoryview, debug: bool = False) -> Optional[str]:
+        """
+        Fills ``view`` completely with bytes received from the server.
+
+        Returns:
+            None on success, otherwise an error message string.
+        """
+        sock = self._socket
+        if sock is None:
+            err_msg = "Communication error: Not connected."
+            logger.error(err_msg)
+            return err_msg
 
-        if debug:
-            logger.debug(f"Sent {len(request)} bytes: {request.hex()}")
-
-        # Receive response - attempt to receive exactly the expected number of bytes
-        response_bytes = b""
-        bytes_to_receive = protocol.RESPONSE_LENGTH
-        _client_socket.settimeout(cfg.SERVER_TIMEOUT)  # Ensure timeout is set for recv
-        start_recv_time = time.monotonic()
-        while len(response_bytes) < bytes_to_receive:
-            # Check timeout manually for recv loop
-            if time.monotonic() - start_recv_time > cfg.SERVER_TIMEOUT:
-                raise socket.timeout("Receive loop timed out")
-
-            remaining_bytes = bytes_to_receive - len(response_bytes)
-            chunk = _client_socket.recv(remaining_bytes)
-            if not chunk:
+        expected = len(view)
+        try:
+            # The timeout set in connect applies to every recv_into call, so
+            # a stalled server raises socket.timeout here without a user timer
+            bytes_received = 0
+            while bytes_received < expected:
+                chunk_size = sock.recv_into(
+                    view[bytes_received:], expected - bytes_received
+                )
+                if not chunk_size:
+                    break
+                bytes_received += chunk_size
+
+            if bytes_received < expected:
                 err_msg = (
                     "Communication error: Connection closed by server during receive."
                 )
                 logger.error(err_msg)
-                socket_disconnect()
-                return None, err_msg
-            response_bytes += chunk
+                self.disconnect(graceful=False)
+                return err_msg
 
-        if debug:
-            logger.debug(
-                f"Received {len(response_bytes)} bytes: {response_bytes.hex()}"
-            )
+            if debug and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received %d bytes: %s", bytes_received, view.hex())
 
-        # Length check (should be guaranteed by loop unless recv error)
-        if len(response_bytes) != protocol.RESPONSE_LENGTH:
-            # This case should ideally not be reached due to the loop structure
-            err_msg = (
-                f"Communication error: Received incomplete/wrong response length. "
-                f"Got {len(response_bytes)}, expected {protocol.RESPONSE_LENGTH}."
-            )
-            logger.error(err_msg)
-            return None, err_msg
+            return None  # Success
 
-        return response_bytes, None  # Success
+        except Exception as e:
+            return self._handle_socket_exception(e)
 
-    except socket.timeout:
-        err_msg = "Communication error: Socket operation timed out."
-        logger.error(err_msg)
-        # Consider forcing disconnect on timeout
-        # socket_disconnect()
-        return None, err_msg
-    except socket.error as e:
-        err_msg = f"Communication error: Socket send/receive error: {e}."
-        logger.error(err_msg)
-        socket_disconnect()  # Assume connection is lost
-        return None, err_msg
-    except Exception as e:
-        err_msg = f"Communication error: Unexpected error during send/receive: {e}."
+    def _handle_socket_exception(self, exc: Exception) -> str:
+        """Log a send/receive exception, drop broken connections, and return the message."""
+
+        if isinstance(exc, socket.timeout):
+            err_msg = "Communication error: Socket operation timed out."
+            logger.error(err_msg)
+            # Responses still in flight (a whole pipelined batch, or the rest
+            # of a partial frame) would otherwise be read as the answers to
+            # later requests, so the connection cannot be reused
+            self.disconnect(graceful=False)
+            return err_msg
+        if isinstance(exc, socket.error):
+            err_msg = f"Communication error: Socket send/receive error: {exc}."
+            logger.error(err_msg)
+            self.disconnect(graceful=False)  # Assume connection is lost
+            return err_msg
+        err_msg = f"Communication error: Unexpected error during send/receive: {exc}."
         logger.error(err_msg)
-        socket_disconnect()  # Assume connection is lost
-        return None, err_msg
+        self.disconnect()  # Assume connection is lost
+        return err_msg
+
+
+# Client used by the module-level functions when no client is passed
+default_client = GriClient()
+
+
+def socket_connect() -> bool:
+    """
+    Establishes the default client's connection to the server defined in gri_config.
+
+    Returns:
+        True if connection is successful, False otherwise.
+    """
+    return default_client.connect()
+
+
+def socket_disconnect(graceful: bool = True):
+    """Closes the default client's TCP socket connection."""
+    default_client.disconnect(graceful=graceful)
+
+
+def socket_send_receive(
+    request: bytes, debug: bool = False
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """Sends a request on the default client; see `GriClient.send_receive`."""
+    return default_client.send_receive(request, debug=debug)
+
+
+def socket_send_receive_batch(
+    requests: Union[bytes, bytearray], count: int, debug: bool = False
+) -> Tuple[Optional[List[bytes]], Optional[str]]:
+    """Sends pipelined requests on the default client; see `GriClient.send_receive_batch`."""
+    return default_client.send_receive_batch(requests, count, debug=debug)
+
+
+def _split_frames(frames: memoryview) -> List[bytes]:
+    """Copy each RESPONSE_LENGTH frame of ``frames`` into its own bytes object."""
+    length = protocol.RESPONSE_LENGTH
+    return [
+        frames[offset : offset + length].tobytes()
+        for offset in range(0, len(frames), length)
+    ]
 
 
 # --- High-Level Interface Functions ---
@@ -302,15 +624,22 @@ def get_current_robot_pose() -> RobotPose:
 
 def get_system_status(
     debug: bool = False,
+    client: Optional[GriClient] = None,
 ) -> Tuple[bool, Optional[protocol.ResponseMessage]]:
     """
     Query the server for system readiness information (STATUS action).
 
+    Args:
+        debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
+
     Returns:
         Tuple[bool, Optional[protocol.ResponseMessage]] where the boolean indicates
         whether the system reports readiness (data_2 == 1).
     """
-    response = _send_action(actions.Action.STATUS, job_id=0, debug=debug)
+    response = (client or default_client).send_action(
+        actions.Action.STATUS, job_id=0, debug=debug
+    )
 
     if response is None:
         return False, None
@@ -334,7 +663,10 @@ def get_system_status(
 
 
 def trigger_job_sync(
-    job_id: int, current_pos_override: Optional[RobotPose] = None, debug: bool = False
+    job_id: int,
+    current_pos_override: Optional[RobotPose] = None,
+    debug: bool = False,
+    client: Optional[GriClient] = None,
 ) -> Tuple[
     bool,
     Optional[RobotPose],
@@ -353,6 +685,7 @@ def trigger_job_sync(
         job_id: The identifier of the job to trigger.
         current_pos_override: If provided, this pose is sent instead of querying the robot.
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         A tuple (success_flag, output_pose_or_None, remaining_primary_or_None,
@@ -360,7 +693,7 @@ def trigger_job_sync(
         parsed protocol response for further inspection.
     """
     pose = current_pos_override if current_pos_override else get_current_robot_pose()
-    response = _send_action(
+    response = (client or default_client).send_action(
         actions.Action.TRIGGER_JOB_SYNC, job_id, pose=pose, debug=debug
     )
 
@@ -390,7 +723,10 @@ def trigger_job_sync(
 
 
 def trigger_job_async(
-    job_id: int, current_pos_override: Optional[RobotPose] = None, debug: bool = False
+    job_id: int,
+    current_pos_override: Optional[RobotPose] = None,
+    debug: bool = False,
+    client: Optional[GriClient] = None,
 ) -> Tuple[bool, Optional[protocol.ResponseMessage]]:
     """
     Triggers a vision job asynchronously.
@@ -403,6 +739,7 @@ def trigger_job_async(
         job_id: The identifier of the job to trigger.
         current_pos_override: If provided, this pose is sent instead of querying the robot.
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         Tuple[bool, Optional[protocol.ResponseMessage]]: Success flag and the parsed response.
@@ -410,7 +747,7 @@ def trigger_job_async(
     current_pos = (
         current_pos_override if current_pos_override else get_current_robot_pose()
     )
-    response = _send_action(
+    response = (client or default_client).send_action(
         actions.Action.TRIGGER_JOB_ASYNC, job_id, pose=current_pos, debug=debug
     )
 
@@ -433,7 +770,7 @@ def trigger_job_async(
 
 
 def get_job_status(
-    job_id: int, debug: bool = False
+    job_id: int, debug: bool = False, client: Optional[GriClient] = None
 ) -> Tuple[int, Optional[protocol.ResponseMessage]]:
     """
     Queries the status of a previously triggered asynchronous job.
@@ -441,12 +778,15 @@ def get_job_status(
     Args:
         job_id: The identifier of the job to query.
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         Tuple[int, Optional[protocol.ResponseMessage]]: The job status code
         (e.g., RUNNING, DONE) and the parsed response object (or None on error).
     """
-    response = _send_action(actions.Action.GET_JOB_STATUS, job_id, debug=debug)
+    response = (client or default_client).send_action(
+        actions.Action.GET_JOB_STATUS, job_id, debug=debug
+    )
 
     if response is None:
         return actions.JobStatus.UNKNOWN, None
@@ -471,7 +811,7 @@ def get_job_status(
 
 
 def get_next_pose(
-    job_id: int, debug: bool = False
+    job_id: int, debug: bool = False, client: Optional[GriClient] = None
 ) -> Tuple[
     bool,
     Optional[RobotPose],
@@ -485,12 +825,15 @@ def get_next_pose(
     Args:
         job_id: The identifier of the job whose results are requested.
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         A tuple (success_flag, output_pose_or_None, remaining_primary_or_None,
         remaining_related_or_None, response_or_None) with the parsed response.
     """
-    response = _send_action(actions.Action.GET_NEXT_POSE, job_id, debug=debug)
+    response = (client or default_client).send_action(
+        actions.Action.GET_NEXT_POSE, job_id, debug=debug
+    )
 
     if response is None:
         return False, None, None, None, None
@@ -527,7 +870,7 @@ def get_next_pose(
 
 
 def get_related_pose(
-    job_id: int, debug: bool = False
+    job_id: int, debug: bool = False, client: Optional[GriClient] = None
 ) -> Tuple[
     bool, Optional[RobotPose], Optional[int], Optional[protocol.ResponseMessage]
 ]:
@@ -537,12 +880,15 @@ def get_related_pose(
     Args:
         job_id: The identifier of the job context.
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         A tuple (success_flag, output_pose_or_None, remaining_related_or_None,
         response_or_None) including the parsed protocol response.
     """
-    response = _send_action(actions.Action.GET_RELATED_POSE, job_id, debug=debug)
+    response = (client or default_client).send_action(
+        actions.Action.GET_RELATED_POSE, job_id, debug=debug
+    )
 
     if response is None:
         return False, None, None, None
@@ -575,101 +921,157 @@ def get_related_pose(
     return False, None, remaining_related, response
 
 
+def drain_primary_poses(
+    job_id: int, debug: bool = False, client: Optional[GriClient] = None
+) -> List[RobotPose]:
+    """
+    Retrieves all remaining primary poses of a job.
+
+    The first pose is fetched with `get_next_pose`. Its remaining_primary count
+    tells how many GET_NEXT_POSE requests to pipeline into the next round trip
+    (at most `protocol.DRAIN_BATCH_SIZE` at a time), so n poses cost about two round
+    trips instead of n. Related poses are not fetched: they belong to the
+    current primary pose, which advances with every GET_NEXT_POSE.
+
+    Args:
+        job_id: The identifier of the job whose results are requested.
+        debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
+
+    Returns:
+        The retrieved poses in server order; empty if none could be fetched.
+    """
+    client = client or default_client
+    success, pose, remaining, _, _ = get_next_pose(job_id, debug=debug, client=client)
+    if not success:
+        return []
+
+    poses = [pose]
+    # Packing only reads the request, so one instance serves the whole batch
+    request = protocol.RequestMessage(actions.Action.GET_NEXT_POSE, job_id)
+    while remaining:
+        requests = [request] * min(remaining, protocol.DRAIN_BATCH_SIZE)
+        responses, comm_error = client.send_actions_batch(requests, debug=debug)
+        if responses is None:
+            logger.error(
+                "drain_primary_poses(job=%s): Communication failed: %s",
+                job_id,
+                comm_error,
+            )
+            break
+
+        remaining = 0
+        for response in responses:
+            if response is None or response.error_code != actions.ErrorCode.NO_ERROR:
+                # NO_POSES_FOUND (or an error) ends the drain
+                remaining = 0
+                break
+            poses.append(_as_robot_pose(response.pose))
+            remaining = response.remaining_primary
+
+    logger.info(
+        "drain_primary_poses(job=%s): Retrieved %s primary poses.", job_id, len(poses)
+    )
+    return poses
+
+
 def wait_for_job(
-    job_id: int, delay_s: float = 1.0, timeout_s: float = 10.0, debug: bool = False
+    job_id: int,
+    delay_s: float = 1.0,
+    timeout_s: float = 10.0,
+    debug: bool = False,
+    client: Optional[GriClient] = None,
 ) -> bool:
     """
     Waits for an asynchronous job to reach a terminal state (DONE or FAILED).
 
-    Polls the job status using `get_job_status` at intervals defined by `delay_s`,
-    until the status is DONE or FAILED, or until `timeout_s` is exceeded.
+    Polls the job status using `get_job_status` until the status is DONE or
+    FAILED, or until `timeout_s` is exceeded. The interval between polls
+    starts short and doubles up to `delay_s`, so quick jobs are noticed
+    within milliseconds while long jobs settle at the requested cadence.
 
     Args:
         job_id: The identifier of the asynchronous job to wait for.
-        delay_s: The time interval (in seconds) between status checks.
+        delay_s: The maximum time interval (in seconds) between status checks.
         timeout_s: The maximum time (in seconds) to wait before failing.
         debug: Enable detailed logging for status checks within the loop.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         bool: True if the job status becomes DONE within the timeout,
               False if the job status becomes FAILED/UNKNOWN or if the timeout is reached.
     """
     start_time = time.monotonic()
+    deadline = start_time + timeout_s
     logger.info(
-        f"wait_for_job(job={job_id}): Waiting up to {timeout_s:.1f}s (polling every {delay_s:.1f}s)..."
+        "wait_for_job(job=%s): Waiting up to %.1fs (polling at most every %.1fs)...",
+        job_id,
+        timeout_s,
+        delay_s,
     )
 
+    cur_delay = min(_WAIT_MIN_DELAY_S, delay_s)
+    first_poll = True
     while True:
-        current_time = time.monotonic()
-        elapsed_time = current_time - start_time
-
-        if elapsed_time > timeout_s:
+        now = time.monotonic()
+        if now > deadline:
             logger.error(
-                f"wait_for_job(job={job_id}): Timeout after {elapsed_time:.1f}s."
+                "wait_for_job(job=%s): Timeout after %.1fs.", job_id, now - start_time
             )
             return False
 
-        # Add a small delay *before* polling to avoid hammering the server immediately
-        # Adjust wait_time calculation slightly.
-        wait_time = min(
-            delay_s, max(0, timeout_s - elapsed_time)
-        )  # Ensure wait_time is non-negative
-        if wait_time > 0:
-            # Only sleep if not the very first check and there's time left
-            if elapsed_time > 0:
-                time.sleep(min(delay_s, wait_time))
-            # Recalculate elapsed time after sleep
-            elapsed_time = time.monotonic() - start_time
-            if elapsed_time >= timeout_s:  # Check timeout again after sleep
+        # Back off exponentially *before* polling again to avoid hammering
+        # the server, but never sleep past the deadline
+        if not first_poll:
+            time.sleep(min(cur_delay, deadline - now))
+            cur_delay = min(cur_delay * 2, delay_s)
+            now = time.monotonic()
+            if now >= deadline:  # Check timeout again after sleep
                 logger.error(
-                    f"wait_for_job(job={job_id}): Timeout immediately after sleep ({elapsed_time:.1f}s)."
+                    "wait_for_job(job=%s): Timeout immediately after sleep (%.1fs).",
+                    job_id,
+                    now - start_time,
                 )
                 return False
-        elif elapsed_time == 0:
-            pass  # First check, don't sleep yet
-        else:  # No time left to wait
-            logger.error(
-                f"wait_for_job(job={job_id}): Timeout condition met before next poll ({elapsed_time:.1f}s)."
-            )
-            return False
+        first_poll = False
 
-        status, _ = get_job_status(job_id, debug=debug)
+        status, _ = get_job_status(job_id, debug=debug, client=client)
 
         if status == actions.JobStatus.DONE:
             logger.info(
-                f"wait_for_job(job={job_id}): Job completed successfully (Status: DONE)."
+                "wait_for_job(job=%s): Job completed successfully (Status: DONE).",
+                job_id,
             )
             return True
         elif status == actions.JobStatus.FAILED:
-            logger.error(f"wait_for_job(job={job_id}): Job failed (Status: FAILED).")
+            logger.error("wait_for_job(job=%s): Job failed (Status: FAILED).", job_id)
             return False
         elif status == actions.JobStatus.UNKNOWN:
             logger.error(
-                f"wait_for_job(job={job_id}): Job status unknown (communication error?). Aborting wait."
+                "wait_for_job(job=%s): Job status unknown (communication error?). Aborting wait.",
+                job_id,
             )
             return False
         elif status in [actions.JobStatus.INACTIVE, actions.JobStatus.RUNNING]:
             logger.debug(
-                f"wait_for_job(job={job_id}): Status={status}. Elapsed={elapsed_time:.1f}s. Continuing wait..."
+                "wait_for_job(job=%s): Status=%s. Elapsed=%.1fs. Continuing wait...",
+                job_id,
+                status,
+                now - start_time,
             )
         else:
             logger.warning(
-                f"wait_for_job(job={job_id}): Received unexpected status code {status}. Continuing wait."
-            )
-
-        # Safety check in case sleep logic fails
-        if time.monotonic() - start_time >= timeout_s:
-            logger.error(
-                f"wait_for_job(job={job_id}): Timeout detected at loop end ({time.monotonic() - start_time:.1f}s)."
+                "wait_for_job(job=%s): Received unexpected status code %s. Continuing wait.",
+                job_id,
+                status,
             )
-            return False
 
 
 # --- Hand-Eye Calibration (HEC) Functions ---
 
 
 def hec_init(
-    pipeline_id: int, debug: bool = False
+    pipeline_id: int, debug: bool = False, client: Optional[GriClient] = None
 ) -> Tuple[bool, Optional[protocol.ResponseMessage]]:
     """
     Initializes the hand-eye calibration process on the server.
@@ -677,11 +1079,12 @@ def hec_init(
     Args:
         pipeline_id: Identifier for the calibration pipeline (sent in data1).
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         Tuple[bool, Optional[protocol.ResponseMessage]] describing whether the call succeeded.
     """
-    response = _send_action(
+    response = (client or default_client).send_action(
         actions.Action.HEC_INIT,
         job_id=0,
         data_fields=(pipeline_id, 0, 0, 0),
@@ -705,7 +1108,11 @@ def hec_init(
 
 
 def hec_set_pose(
-    pipeline_id: int, slot_id: int, pose_to_set: RobotPose, debug: bool = False
+    pipeline_id: int,
+    slot_id: int,
+    pose_to_set: RobotPose,
+    debug: bool = False,
+    client: Optional[GriClient] = None,
 ) -> Tuple[bool, Optional[protocol.ResponseMessage]]:
     """
     Sends a robot pose to the server for use in hand-eye calibration.
@@ -715,18 +1122,84 @@ def hec_set_pose(
         slot_id: The index (usually 1-based) for this calibration pose (sent in data2).
         pose_to_set: The RobotPose object representing the robot's pose.
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         Tuple[bool, Optional[protocol.ResponseMessage]] indicating success and parsed response.
     """
-    response = _send_action(
-        actions.Action.HEC_SET_POSE,
-        job_id=0,
-        pose=pose_to_set,
-        data_fields=(pipeline_id, slot_id, 0, 0),
-        debug=debug,
+    response = (client or default_client).hec_set_pose(
+        pipeline_id, slot_id, pose_to_set, debug=debug
+    )
+    return _hec_set_pose_result(pipeline_id, slot_id, response)
+
+
+def hec_set_poses_batch(
+    pipeline_id: int,
+    slot_poses: Sequence[Tuple[int, RobotPose]],
+    pipeline: bool = True,
+    debug: bool = False,
+    client: Optional[GriClient] = None,
+) -> List[Tuple[bool, Optional[protocol.ResponseMessage]]]:
+    """
+    Sends several hand-eye calibration poses in one pipelined burst.
+
+    All HEC_SET_POSE requests are written back-to-back before any response is
+    read, so the batch costs about one round trip instead of one per slot.
+    Only use this when the poses do not require robot motion in between (e.g.
+    previously recorded or simulated poses); a real robot has to be at each
+    pose when it is set.
+
+    Args:
+        pipeline_id: Identifier for the calibration pipeline (sent in data1).
+        slot_poses: Sequence of (slot_id, pose) pairs, sent in the given order.
+        pipeline: If False, falls back to one `hec_set_pose` round trip per slot.
+        debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
+
+    Returns:
+        List of (success_flag, response_or_None) tuples, one per slot in input order.
+    """
+    if not pipeline:
+        return [
+            hec_set_pose(pipeline_id, slot_id, pose, debug=debug, client=client)
+            for slot_id, pose in slot_poses
+        ]
+
+    if not slot_poses:
+        return []
+
+    requests = [
+        protocol.RequestMessage(
+            action=actions.Action.HEC_SET_POSE,
+            job_id=0,
+            pose=pose,
+            data_fields=(pipeline_id, slot_id, 0, 0),
+        )
+        for slot_id, pose in slot_poses
+    ]
+    responses, comm_error = (client or default_client).send_actions_batch(
+        requests, debug=debug
     )
 
+    if responses is None:
+        logger.error(
+            "hec_set_poses_batch(pipeline=%s): Communication failed: %s",
+            pipeline_id,
+            comm_error,
+        )
+        return [(False, None) for _ in slot_poses]
+
+    return [
+        _hec_set_pose_result(pipeline_id, slot_id, response)
+        for (slot_id, _), response in zip(slot_poses, responses)
+    ]
+
+
+def _hec_set_pose_result(
+    pipeline_id: int, slot_id: int, response: Optional[protocol.ResponseMessage]
+) -> Tuple[bool, Optional[protocol.ResponseMessage]]:
+    """Evaluate and log the response to a single HEC_SET_POSE request."""
+
     if response is None:
         return False, None
 
@@ -749,7 +1222,7 @@ def hec_set_pose(
 
 
 def hec_calibrate(
-    pipeline_id: int, debug: bool = False
+    pipeline_id: int, debug: bool = False, client: Optional[GriClient] = None
 ) -> Tuple[bool, Optional[protocol.ResponseMessage]]:
     """
     Commands the server to perform the hand-eye calibration calculation.
@@ -757,11 +1230,12 @@ def hec_calibrate(
     Args:
         pipeline_id: Identifier for the calibration pipeline (sent in data1).
         debug: Enable detailed logging for this call.
+        client: The GriClient to use; defaults to `default_client`.
 
     Returns:
         Tuple[bool, Optional[protocol.ResponseMessage]] indicating success acknowledgement.
     """
-    response = _send_action(
+    response = (client or default_client).send_action(
         actions.Action.HEC_CALIBRATE,
         job_id=0,
         data_fields=(pipeline_id, 0, 0, 0),
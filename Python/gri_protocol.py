@@ -11,10 +11,12 @@ additional payload fields.
 from __future__ import annotations
 
 import logging
-import math
 import struct
 from dataclasses import dataclass, field
-from typing import Optional, Sequence, Tuple
+from functools import cached_property, lru_cache
+from itertools import chain
+from math import sqrt
+from typing import Dict, Optional, Sequence, Tuple
 
 import gri_actions as actions
 
@@ -22,11 +24,37 @@ logger = logging.getLogger(__name__)
 
 # Protocol constants (version 1, quaternion XYZW pose representation)
 PROTOCOL_VERSION = 1
+# Plain int so packing and comparisons skip the IntEnum layer
+POSE_FORMAT = int(actions.PoseFormat.QUATERNION_XYZW)
 REQUEST_MAGIC = int.from_bytes(b"GRI\0", "little")
 RESPONSE_MAGIC = REQUEST_MAGIC
 REQUEST_LENGTH = 54
 RESPONSE_LENGTH = 80
 POSE_SCALE_FACTOR = 1_000_000
+# Maximum number of GET_NEXT_POSE requests the clients' drain_primary_poses
+# pipelines into one round trip
+DRAIN_BATCH_SIZE = 32
+
+# Full request layout: header (magic, version, length, pose format, action),
+# job id, seven scaled pose values and four data fields.
+_REQUEST_STRUCT = struct.Struct("<I4BH7i4i")
+assert _REQUEST_STRUCT.size == REQUEST_LENGTH
+# Full response layout: the same header, job id, signed error code, seven
+# scaled pose values and ten data fields.
+_RESPONSE_STRUCT = struct.Struct("<I4BHh7i10i")
+assert _RESPONSE_STRUCT.size == RESPONSE_LENGTH
+# Request offsets of the scaled pose and the data fields, and their layouts
+_REQUEST_POSE_OFFSET = 10
+_REQUEST_DATA_OFFSET = 38
+_POSE_STRUCT = struct.Struct("<7i")
+_DATA_FIELD_STRUCT = struct.Struct("<i")
+
+# Squared quaternion norms that can be normalized directly without losing
+# precision to underflow or overflow
+_NORM_SQ_MIN = 1e-150
+_NORM_SQ_MAX = 1e150
+# Squared norms this close to 1 are treated as unit length
+_UNIT_NORM_SQ_TOL = 1e-12
 
 
 def float_to_scaled(value: float) -> int:
@@ -41,7 +69,32 @@ def scaled_to_float(value: int) -> float:
     return float(value) / POSE_SCALE_FACTOR
 
 
-@dataclass
+def _unit_quaternion(
+    q1: float, q2: float, q3: float, q4: float
+) -> Tuple[float, float, float, float]:
+    """Return the quaternion scaled to unit length (identity if it is zero)."""
+
+    norm_sq = q1 * q1 + q2 * q2 + q3 * q3 + q4 * q4
+    if -_UNIT_NORM_SQ_TOL < norm_sq - 1.0 < _UNIT_NORM_SQ_TOL:
+        # Already unit length (e.g. the identity): rescaling would not change
+        # the scaled wire integers
+        return q1, q2, q3, q4
+    if _NORM_SQ_MIN < norm_sq < _NORM_SQ_MAX:
+        # Common case: one reciprocal square root, then four multiplications
+        scale = 1.0 / sqrt(norm_sq)
+        return q1 * scale, q2 * scale, q3 * scale, q4 * scale
+
+    # Zero, or so small/large that the squares under-/overflow: rescale by
+    # the largest component first (as LAPACK's dnrm2 does)
+    largest = max(abs(q1), abs(q2), abs(q3), abs(q4))
+    if largest <= 0.0:
+        return 0.0, 0.0, 0.0, 1.0
+    q1, q2, q3, q4 = q1 / largest, q2 / largest, q3 / largest, q4 / largest
+    scale = 1.0 / sqrt(q1 * q1 + q2 * q2 + q3 * q3 + q4 * q4)
+    return q1 * scale, q2 * scale, q3 * scale, q4 * scale
+
+
+@dataclass(slots=True)
 class Pose:
     """Robot pose encoded as millimeters + quaternion."""
 
@@ -56,47 +109,73 @@ class Pose:
     def normalize(self) -> None:
         """Normalize quaternion components to unit length."""
 
-        magnitude = math.sqrt(self.q1**2 + self.q2**2 + self.q3**2 + self.q4**2)
-        if magnitude <= 0.0:
-            self.q1, self.q2, self.q3, self.q4 = 0.0, 0.0, 0.0, 1.0
-            return
+        self.q1, self.q2, self.q3, self.q4 = _unit_quaternion(
+            self.q1, self.q2, self.q3, self.q4
+        )
+
+    def as_tuple(self) -> Tuple[float, float, float, float, float, float, float]:
+        """Return the pose components in wire order (x, y, z, q1..q4)."""
 
-        self.q1 /= magnitude
-        self.q2 /= magnitude
-        self.q3 /= magnitude
-        self.q4 /= magnitude
+        return (self.x, self.y, self.z, self.q1, self.q2, self.q3, self.q4)
 
     def to_scaled_tuple(self) -> Tuple[int, int, int, int, int, int, int]:
-        """Return the pose components scaled to protocol integers."""
+        """
+        Return the pose components scaled to protocol integers.
 
-        self.normalize()
+        The quaternion is normalized for the wire only; the pose itself is not
+        modified, so callers can pass their poses without copying them.
+        """
+
+        q1, q2, q3, q4 = _unit_quaternion(self.q1, self.q2, self.q3, self.q4)
+        # float_to_scaled inlined: this runs for every request carrying a pose
+        scale = POSE_SCALE_FACTOR
         return (
-            float_to_scaled(self.x),
-            float_to_scaled(self.y),
-            float_to_scaled(self.z),
-            float_to_scaled(self.q1),
-            float_to_scaled(self.q2),
-            float_to_scaled(self.q3),
-            float_to_scaled(self.q4),
+            int(round(self.x * scale)),
+            int(round(self.y * scale)),
+            int(round(self.z * scale)),
+            int(round(q1 * scale)),
+            int(round(q2 * scale)),
+            int(round(q3 * scale)),
+            int(round(q4 * scale)),
         )
 
+    def to_scaled_bytes(self) -> bytes:
+        """Return the scaled pose as its 28-byte little-endian wire block."""
+
+        return _POSE_STRUCT.pack(*self.to_scaled_tuple())
+
     @classmethod
     def from_scaled_tuple(cls, values: Sequence[int]) -> "Pose":
         """Instantiate a pose from scaled protocol integers."""
 
         if len(values) != 7:
             raise ValueError(f"Expected 7 pose components, received {len(values)}.")
+        return cls._from_scaled_fields(values, 0)
+
+    @classmethod
+    def _from_scaled_fields(cls, fields: Sequence[int], offset: int) -> "Pose":
+        """Instantiate a pose from the seven scaled integers at *offset* in *fields*."""
+
+        # scaled_to_float inlined: this runs for every decoded response
+        scale = POSE_SCALE_FACTOR
         return cls(
-            x=scaled_to_float(values[0]),
-            y=scaled_to_float(values[1]),
-            z=scaled_to_float(values[2]),
-            q1=scaled_to_float(values[3]),
-            q2=scaled_to_float(values[4]),
-            q3=scaled_to_float(values[5]),
-            q4=scaled_to_float(values[6]),
+            fields[offset] / scale,
+            fields[offset + 1] / scale,
+            fields[offset + 2] / scale,
+            fields[offset + 3] / scale,
+            fields[offset + 4] / scale,
+            fields[offset + 5] / scale,
+            fields[offset + 6] / scale,
         )
 
 
+# Shared pose for requests that carry none; safe because packing only reads it
+_DEFAULT_POSE = Pose()
+
+# Response action codes mapped to their enum members, without Enum call overhead
+_ACTION_BY_CODE: Dict[int, actions.Action] = {int(a): a for a in actions.Action}
+
+
 @dataclass
 class RequestMessage:
     """High-level representation of a protocol request."""
@@ -107,6 +186,11 @@ class RequestMessage:
     data_fields: Sequence[int] = field(default_factory=lambda: (0, 0, 0, 0))
 
     def __post_init__(self) -> None:
+        self.validate()
+
+    def validate(self) -> None:
+        """Raise ValueError unless the request carries exactly four data fields."""
+
         if len(self.data_fields) != 4:
             raise ValueError(
                 "RequestMessage requires exactly four additional data fields."
@@ -115,37 +199,84 @@ class RequestMessage:
     def to_bytes(self) -> bytes:
         """Pack the request into its 54-byte binary representation."""
 
-        header = struct.pack(
-            "<I4B",
+        # The struct layout fixes the size at REQUEST_LENGTH bytes
+        return _REQUEST_STRUCT.pack(*self.wire_values())
+
+    def pack_into(self, buffer: bytearray, offset: int = 0) -> None:
+        """Pack the request into *buffer* at *offset* without allocating."""
+
+        _REQUEST_STRUCT.pack_into(buffer, offset, *self.wire_values())
+
+    def wire_values(self) -> Tuple[int, ...]:
+        """Return the request as the flat value sequence of the wire layout."""
+
+        pose = self.pose or _DEFAULT_POSE
+        return (
             REQUEST_MAGIC,
             PROTOCOL_VERSION,
             REQUEST_LENGTH,
-            actions.PoseFormat.QUATERNION_XYZW,
+            POSE_FORMAT,
             int(self.action),
+            self.job_id,
+            *pose.to_scaled_tuple(),
+            *self.data_fields,
+        )
+
+
+class RequestTemplate:
+    """
+    A packed request whose pose and data fields can be rewritten in place.
+
+    Useful when the same action is sent repeatedly with only a few fields
+    changing (e.g. HEC_SET_POSE for consecutive slots): the constant header is
+    packed once and no RequestMessage is built per request.
+    """
+
+    __slots__ = ("buffer",)
+
+    def __init__(
+        self,
+        action: actions.Action,
+        job_id: int = 0,
+        data_fields: Sequence[int] = (0, 0, 0, 0),
+    ) -> None:
+        self.buffer = bytearray(REQUEST_LENGTH)
+        RequestMessage(action, job_id, data_fields=data_fields).pack_into(self.buffer)
+
+    def set_pose(self, pose: Pose) -> None:
+        """Overwrite the scaled pose of the request."""
+
+        _POSE_STRUCT.pack_into(
+            self.buffer, _REQUEST_POSE_OFFSET, *pose.to_scaled_tuple()
         )
 
-        job_id_bytes = self.job_id.to_bytes(2, byteorder="little", signed=False)
+    def set_data_field(self, index: int, value: int) -> None:
+        """Overwrite data field *index* (0-3) of the request."""
 
-        pose = self.pose or Pose()
-        pose_values = pose.to_scaled_tuple()
-        pose_bytes = struct.pack("<iii", *pose_values[:3]) + struct.pack(
-            "<iiii", *pose_values[3:]
+        if not 0 <= index < 4:
+            raise ValueError("Data field index must be between 0 and 3.")
+        _DATA_FIELD_STRUCT.pack_into(
+            self.buffer, _REQUEST_DATA_OFFSET + 4 * index, value
         )
-        data_bytes = struct.pack("<4i", *self.data_fields)
 
-        packed = bytearray(header)
-        packed.extend(job_id_bytes)
-        packed.extend(pose_bytes)
-        packed.extend(data_bytes)
 
-        if len(packed) != REQUEST_LENGTH:
-            logger.warning(
-                "Packed request length mismatch (expected %s, got %s).",
-                REQUEST_LENGTH,
-                len(packed),
-            )
+def pack_requests(requests: Sequence[RequestMessage]) -> bytes:
+    """
+    Pack several requests back-to-back with a single struct call.
 
-        return bytes(packed)
+    Used for pipelined batches; the result is len(requests) * REQUEST_LENGTH bytes.
+    """
+
+    return _batch_request_struct(len(requests)).pack(
+        *chain.from_iterable(request.wire_values() for request in requests)
+    )
+
+
+@lru_cache(maxsize=16)
+def _batch_request_struct(count: int) -> struct.Struct:
+    """Return a Struct describing *count* consecutive requests."""
+
+    return struct.Struct("<" + _REQUEST_STRUCT.format.lstrip("<") * count)
 
 
 @dataclass
@@ -167,8 +298,10 @@ class ResponseMessage:
                 f"Expected {RESPONSE_LENGTH} byte response, got {len(payload)} bytes."
             )
 
-        magic, proto_ver, msg_len, pose_format, action_code = struct.unpack(
-            "<I4B", payload[0:8]
+        # One unpack of the whole frame; unpack_from avoids slicing the payload
+        fields = _RESPONSE_STRUCT.unpack_from(payload)
+        magic, proto_ver, msg_len, pose_format, action_code, job_id, error_code = (
+            fields[:7]
         )
 
         if magic != RESPONSE_MAGIC:
@@ -181,39 +314,36 @@ class ResponseMessage:
             )
         if msg_len != RESPONSE_LENGTH:
             raise ValueError(f"Response header length mismatch: {msg_len}")
-        if pose_format != actions.PoseFormat.QUATERNION_XYZW:
+        if pose_format != POSE_FORMAT:
             logger.warning(
                 "Pose format mismatch: response=%s expected=%s",
                 pose_format,
-                actions.PoseFormat.QUATERNION_XYZW,
+                POSE_FORMAT,
             )
 
-        job_id = int.from_bytes(payload[8:10], byteorder="little", signed=False)
-        error_code = int.from_bytes(payload[10:12], byteorder="little", signed=True)
-
-        pose_values = struct.unpack("<iii", payload[12:24]) + struct.unpack(
-            "<iiii", payload[24:40]
-        )
-        pose = Pose.from_scaled_tuple(pose_values)
-
-        data_fields = struct.unpack("<10i", payload[40:80])
+        # Build the pose straight from the unpacked fields; slicing them out
+        # for from_scaled_tuple would allocate another tuple per response
+        pose = Pose._from_scaled_fields(fields, 7)
+        data_fields = fields[14:]
 
-        try:
-            action = actions.Action(action_code)
-        except ValueError:
+        action = _ACTION_BY_CODE.get(action_code)
+        if action is None:
             logger.warning(
                 "Unknown action code in response: %s. Defaulting to STATUS.",
                 action_code,
             )
             action = actions.Action.STATUS
 
-        return cls(
-            action=action,
-            job_id=job_id,
-            error_code=error_code,
-            pose=pose,
-            data_fields=tuple(data_fields),
-        )
+        # Positional arguments in field order skip keyword matching in __init__
+        return cls(action, job_id, error_code, pose, data_fields)
+
+    @cached_property
+    def error_description(self) -> Optional[str]:
+        """Human-readable error/warning description, or None on success (cached)."""
+
+        if self.error_code == actions.ErrorCode.NO_ERROR:
+            return None
+        return actions.describe_error(self.error_code)
 
     @property
     def node_return_code(self) -> int:
@@ -242,7 +372,4 @@ def iter_pose_bytes(pose: Pose) -> bytes:
     Mainly useful for debugging or test verification.
     """
 
-    pose_values = pose.to_scaled_tuple()
-    return struct.pack("<iii", *pose_values[:3]) + struct.pack(
-        "<iiii", *pose_values[3:]
-    )
+    return pose.to_scaled_bytes()